@@ -1,9 +1,66 @@
+import asyncio
+
 import grpc
 import numpy as np
 
 import brainmaze_mef3_server.protobufs.gRPCMef3Server_pb2 as pb2
 import brainmaze_mef3_server.protobufs.gRPCMef3Server_pb2_grpc as pb2_grpc
 
+
+def _assemble_segment(chunks):
+    """
+    Assemble streamed SignalChunk messages into a single segment dict.
+
+    Args:
+        chunks (iterable): SignalChunk messages in stream order.
+    Returns:
+        dict: See Mef3Client.get_signal_segment.
+    """
+    arrays = []
+    channel_names = None
+    fs = None
+    start_uutc = None
+    end_uutc = None
+    dtype = None
+    shape = None
+    error_message = None
+    for chunk in chunks:
+        if chunk.error_message:
+            error_message = chunk.error_message
+            break
+        arr = np.frombuffer(chunk.array_bytes, dtype=chunk.dtype)
+        arr = arr.reshape(chunk.shape)
+        arrays.append(arr)
+        channel_names = list(chunk.channel_names)
+        dtype = chunk.dtype
+        fs = chunk.fs
+        shape = tuple(chunk.shape)
+        start_uutc = chunk.start_uutc if start_uutc is None else min(start_uutc, chunk.start_uutc)
+        end_uutc = chunk.end_uutc if end_uutc is None else max(end_uutc, chunk.end_uutc)
+    if not arrays:
+        return {
+            'array': None,
+            'channel_names': channel_names,
+            'fs': fs,
+            'start_uutc': start_uutc,
+            'end_uutc': end_uutc,
+            'dtype': dtype,
+            'shape': shape,
+            'error_message': error_message or 'No data returned.'
+        }
+    array = np.concatenate(arrays, axis=1) if len(arrays) > 1 else arrays[0]
+    return {
+        'array': array,
+        'channel_names': channel_names,
+        'fs': fs,
+        'start_uutc': start_uutc,
+        'end_uutc': end_uutc,
+        'dtype': dtype,
+        'shape': array.shape,
+        'error_message': error_message or ''
+    }
+
+
 class Mef3Client:
     """
     Client for interacting with the MEF3 gRPC server.
@@ -17,6 +74,9 @@ class Mef3Client:
         client.open_file("/path/to/file.mefd")
         ...
         client.shutdown()
+
+    Signal segments can also be fetched from asyncio code with ``await client.aget_signal_segment(...)``;
+    call ``await client.aclose()`` from the same event loop when done.
     """
 
     def __init__(self, address="localhost:50052"):
@@ -26,8 +86,13 @@ class Mef3Client:
         Args:
             address (str): Address of the gRPC server (default: "localhost:50052").
         """
+        self.address = address
         self.channel = grpc.insecure_channel(address)
         self.stub = pb2_grpc.gRPCMef3ServerStub(self.channel)
+        # grpc.aio channel for the async API, created lazily and bound to one event loop
+        self._aio_channel = None
+        self._aio_stub = None
+        self._aio_loop = None
 
     def open_file(self, file_path):
         """
@@ -122,49 +187,39 @@ class Mef3Client:
             }
         """
         req = pb2.SignalChunkRequest(file_path=file_path, chunk_idx=chunk_idx)
-        arrays = []
-        channel_names = None
-        fs = None
-        start_uutc = None
-        end_uutc = None
-        dtype = None
-        shape = None
-        error_message = None
-        for chunk in self.stub.GetSignalSegment(req):
-            if chunk.error_message:
-                error_message = chunk.error_message
-                break
-            arr = np.frombuffer(chunk.array_bytes, dtype=chunk.dtype)
-            arr = arr.reshape(chunk.shape)
-            arrays.append(arr)
-            channel_names = list(chunk.channel_names)
-            dtype = chunk.dtype
-            fs = chunk.fs
-            shape = tuple(chunk.shape)
-            start_uutc = chunk.start_uutc if start_uutc is None else min(start_uutc, chunk.start_uutc)
-            end_uutc = chunk.end_uutc if end_uutc is None else max(end_uutc, chunk.end_uutc)
-        if not arrays:
-            return {
-                'array': None,
-                'channel_names': channel_names,
-                'fs': fs,
-                'start_uutc': start_uutc,
-                'end_uutc': end_uutc,
-                'dtype': dtype,
-                'shape': shape,
-                'error_message': error_message or 'No data returned.'
-            }
-        array = np.concatenate(arrays, axis=1) if len(arrays) > 1 else arrays[0]
-        return {
-            'array': array,
-            'channel_names': channel_names,
-            'fs': fs,
-            'start_uutc': start_uutc,
-            'end_uutc': end_uutc,
-            'dtype': dtype,
-            'shape': array.shape,
-            'error_message': error_message or ''
-        }
+        return _assemble_segment(self.stub.GetSignalSegment(req))
+
+    def _get_aio_stub(self):
+        """Return a grpc.aio stub bound to the running event loop, (re)creating the channel if needed.
+
+        A channel left by a loop that has since been closed is replaced. One bound to a loop that is
+        still open cannot be released from here, so switching loops raises instead of leaking it.
+        """
+        loop = asyncio.get_running_loop()
+        if self._aio_loop is not None and self._aio_loop is not loop and not self._aio_loop.is_closed():
+            raise RuntimeError(
+                "Mef3Client async channel is bound to another running event loop; "
+                "await aclose() on that loop before using the client from a new one"
+            )
+        if self._aio_stub is None or self._aio_loop is not loop:
+            self._aio_channel = grpc.aio.insecure_channel(self.address)
+            self._aio_stub = pb2_grpc.gRPCMef3ServerStub(self._aio_channel)
+            self._aio_loop = loop
+        return self._aio_stub
+
+    async def aget_signal_segment(self, file_path, chunk_idx):
+        """
+        Asyncio variant of get_signal_segment, using a grpc.aio channel.
+
+        Args:
+            file_path (str): Path to the MEF3 file.
+            chunk_idx (int): Index of the segment to retrieve.
+        Returns:
+            dict: Same structure as get_signal_segment.
+        """
+        req = pb2.SignalChunkRequest(file_path=file_path, chunk_idx=chunk_idx)
+        chunks = [chunk async for chunk in self._get_aio_stub().GetSignalSegment(req)]
+        return _assemble_segment(chunks)
 
     def list_open_files(self):
         """
@@ -230,3 +285,13 @@ class Mef3Client:
         Close the gRPC channel and clean up resources.
         """
         self.channel.close()
+
+    async def aclose(self):
+        """
+        Close the asyncio gRPC channel, if one was opened. Must be awaited on the loop that used it.
+        """
+        if self._aio_channel is not None:
+            await self._aio_channel.close()
+        self._aio_channel = None
+        self._aio_stub = None
+        self._aio_loop = None
@@ -7,6 +7,7 @@ import signal
 import sys
 import time
 from brainmaze_mef3_server.server.mef3_server import gRPCMef3ServerHandler
+from brainmaze_mef3_server.server.log_manager import stop_logging
 
 print("[MEF3 SERVER] Starting server from __main__.py...")
 
@@ -36,6 +37,8 @@ def main():
         """Handles SIGTERM/SIGINT for graceful shutdown."""
         print("Received termination signal, shutting down...")
         handler.stop()
+        # Drain queued log records before the process exits
+        stop_logging()
         sys.exit(0)
 
     signal.signal(signal.SIGTERM, handle_sigterm)
@@ -84,3 +84,144 @@ class LRUCache:
         with self.lock:
             self.cache.clear()
 
+
+
+class _TieredEntry:
+    """Cache slot holding a value and its 'accessed since last cycled' flag."""
+    __slots__ = ('value', 'accessed')
+
+    def __init__(self, value):
+        self.value = value
+        self.accessed = False
+
+
+class TieredCache:
+    """A thread-safe pseudo-LRU cache with hot, warm and cold segments (TU-Q policy).
+
+    New items enter the hot segment. When a segment overflows, its oldest item is
+    cycled: items read since they were last cycled are promoted to (or kept in) the
+    warm segment, the rest move on to cold and are finally evicted from there. Hits
+    only set a flag instead of reordering, so re-referenced items survive a pass over
+    other keys (e.g. paging forward and then back) that would flush a strict LRU.
+
+    Attributes:
+        capacity (int): Maximum number of items the cache can hold.
+        lock (threading.Lock): Serializes inserts and segment cycling.
+    """
+    def __init__(self, capacity: int):
+        """Initializes the TieredCache.
+
+        Args:
+            capacity (int): The maximum number of items the cache can hold. Must be non-negative.
+
+        Raises:
+            ValueError: If capacity is negative.
+        """
+        if capacity < 0:
+            raise ValueError("Capacity must be non-negative")
+        self.capacity = capacity
+        self._hot_capacity = capacity // 3
+        self._warm_capacity = capacity // 3
+        self._cold_capacity = capacity - self._hot_capacity - self._warm_capacity
+        self._entries = {}
+        self._hot = collections.deque()
+        self._warm = collections.deque()
+        self._cold = collections.deque()
+        self.lock = threading.Lock()
+
+    def get(self, key):
+        """Retrieves an item from the cache and marks it as accessed.
+
+        Lookups do not take the lock: a dict read is atomic and the flag is only a hint
+        consumed when the item's segment is next cycled.
+
+        Args:
+            key: The key to retrieve from the cache.
+
+        Returns:
+            The value associated with the key, or None if not found.
+        """
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        entry.accessed = True
+        return entry.value
+
+    def put(self, key, value):
+        """Adds an item to the hot segment, cycling segments that exceed their capacity.
+
+        Args:
+            key: The key to add or update in the cache.
+            value: The value to associate with the key.
+        """
+        with self.lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                entry.value = value
+                entry.accessed = True
+                return
+            self._entries[key] = _TieredEntry(value)
+            self._hot.append(key)
+            self._cycle()
+
+    def _cycle(self):
+        """Moves overflowing items hot -> warm/cold -> evicted. Assumes lock is held."""
+        while len(self._hot) > self._hot_capacity:
+            key = self._hot.popleft()
+            entry = self._entries[key]
+            if entry.accessed:
+                entry.accessed = False
+                self._warm.append(key)
+            else:
+                self._cold.append(key)
+
+        self._cycle_warm()
+
+        while len(self._cold) > self._cold_capacity:
+            key = self._cold.popleft()
+            entry = self._entries[key]
+            if entry.accessed and self._warm_capacity:
+                entry.accessed = False
+                self._warm.append(key)
+                self._cycle_warm()
+            else:
+                del self._entries[key]
+
+    def _cycle_warm(self):
+        """Keeps accessed items in warm and demotes the rest to cold. Assumes lock is held."""
+        # Re-queued items have their flag cleared, so this runs at most 2*len(warm) times
+        while len(self._warm) > self._warm_capacity:
+            key = self._warm.popleft()
+            entry = self._entries[key]
+            if entry.accessed:
+                entry.accessed = False
+                self._warm.append(key)
+            else:
+                self._cold.append(key)
+
+    def __contains__(self, key):
+        """Checks if a key is in the cache.
+
+        Args:
+            key: The key to check for existence in the cache.
+
+        Returns:
+            bool: True if the key is in the cache, False otherwise.
+        """
+        return key in self._entries
+
+    def __len__(self):
+        """Returns the number of items in the cache.
+
+        Returns:
+            int: Number of items currently in the cache.
+        """
+        return len(self._entries)
+
+    def clear(self):
+        """Clears all items from the cache."""
+        with self.lock:
+            self._entries.clear()
+            self._hot.clear()
+            self._warm.clear()
+            self._cold.clear()
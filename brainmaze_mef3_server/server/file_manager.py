@@ -1,9 +1,10 @@
 from concurrent import futures
+from collections import OrderedDict, deque
 import threading
 import numpy as np
 import brainmaze_mef3_server.protobufs.gRPCMef3Server_pb2 as gRPCMef3Server_pb2
 
-from brainmaze_mef3_server.server.cache import LRUCache
+from brainmaze_mef3_server.server.cache import LRUCache, TieredCache
 from mef_tools import MefReader
 from brainmaze_mef3_server.server.log_manager import get_logger
 import os
@@ -31,16 +32,21 @@ class FileManager:
 
     This class provides efficient, concurrent access to MEF3 files, including:
       - File open/close and info management
-      - LRU caching and asynchronous prefetching of signal segments
+      - LRU (or optional tiered hot/warm/cold) caching and asynchronous prefetching of signal segments
       - Chunking of signal data for streaming
       - Active channel selection and order preservation
       - Error handling for invalid requests and file states
 
-    Thread safety is ensured via a lock for all state-changing operations. Each file is managed independently.
+    Thread safety is ensured via per-shard locks: file state is partitioned by path hash, so each file is managed independently
+    and operations on different files rarely contend.
     The cache and prefetching system is designed for high-throughput, low-latency access to large files.
     """
 
-    def __init__(self, n_prefetch=2, cache_capacity_multiplier=5, max_workers=4):
+    _N_SHARDS = 16  # power of two, shard index is hash(file_path) & (_N_SHARDS - 1)
+    _COALESCE_READ_S = 30.0  # target span of one prefetch read when segments are short
+    _BUFFER_POOL_MAX_BYTES = 256 * 1024 * 1024  # idle pooled arrays kept across all size classes
+
+    def __init__(self, n_prefetch=2, cache_capacity_multiplier=5, max_workers=4, cache_class=LRUCache):
         """
         Initialize the FileManager.
 
@@ -48,36 +54,229 @@ class FileManager:
             n_prefetch (int): Number of chunks to prefetch before and after each request.
             cache_capacity_multiplier (int): Additional cache capacity beyond the prefetch window.
             max_workers (int): Maximum number of background threads for prefetching.
+            cache_class (type): Per-file segment cache, ``LRUCache`` (default) or ``TieredCache``.
         """
-        self._files = {}
-        self._lock = threading.Lock()
+        # Per-file state is split across shards, each with its own lock, so requests for
+        # different files do not serialize on one mutex: [({file_path: state}, lock), ...]
+        self._shards = [({}, threading.Lock()) for _ in range(self._N_SHARDS)]
 
         # --- NEW: Configuration for caching ---
         self.n_prefetch = n_prefetch  # Number of chunks to prefetch before and after
         self.cache_capacity = (n_prefetch * 2) + cache_capacity_multiplier
+        self._cache_class = cache_class
+        # Sequential readahead may grow to 4x n_prefetch, as long as both windows fit two thirds of
+        # the cache. The last third absorbs coalesced groups reaching past the window (and is the
+        # warm segment of a TieredCache, which does not hold prefetched, not-yet-read segments)
+        self._max_readahead = max(n_prefetch, min(4 * n_prefetch, (2 * self.cache_capacity) // 3 - n_prefetch))
 
         # --- NEW: Dedicated thread pool for background data loading ---
         self._prefetch_executor = futures.ThreadPoolExecutor(
             max_workers=max_workers, thread_name_prefix='cache_prefetch'
         )
-        # Track in-progress prefetches: {file_path: {chunk_idx: threading.Event}}
-        self._in_progress = {}
+
+        # Size-class pool of scratch arrays for per-request channel selection: {(shape, dtype): deque},
+        # ordered by last release so classes no longer requested (old window sizes, channel sets,
+        # closed files) are dropped first once the pool exceeds _BUFFER_POOL_MAX_BYTES
+        self._buffer_pool = OrderedDict()
+        self._buffer_pool_bytes = 0
+        self._buffer_pool_lock = threading.Lock()
+        self._buffer_pool_size = 2 * (n_prefetch + 1)  # max arrays kept per size class
+
+    def _shard_for(self, file_path):
+        """Returns the ``(files, lock)`` shard that owns ``file_path``.
+
+        Args:
+            file_path (str): Path to the MEF file.
+
+        Returns:
+            tuple: The shard's ``{file_path: state}`` dict and the lock guarding it.
+        """
+        return self._shards[hash(file_path) & (self._N_SHARDS - 1)]
+
+    def _get_state(self, file_path):
+        """Returns the internal state dict of an open file, or None if it is not open."""
+        files, lock = self._shard_for(file_path)
+        with lock:
+            return files.get(file_path)
+
+    def acquire_buffer(self, shape, dtype=np.float64):
+        """Returns an uninitialized array from the buffer pool, allocating one if the size class is empty.
+
+        Args:
+            shape (tuple): Shape of the requested array.
+            dtype: Numpy dtype of the requested array.
+
+        Returns:
+            np.ndarray: Array of the given shape and dtype with undefined contents.
+        """
+        key = (tuple(shape), np.dtype(dtype))
+        with self._buffer_pool_lock:
+            bucket = self._buffer_pool.get(key)
+            if bucket:
+                arr = bucket.pop()
+                self._buffer_pool_bytes -= arr.nbytes
+                if not bucket:
+                    del self._buffer_pool[key]
+                return arr
+        return np.empty(shape, dtype=dtype)
+
+    def release_buffer(self, arr):
+        """Returns an array obtained from ``acquire_buffer`` to the pool.
+
+        The caller must not use the array afterwards. Arrays beyond the per-class bound are dropped,
+        and arrays of the least recently released size classes are dropped to keep the pool within
+        ``_BUFFER_POOL_MAX_BYTES``.
+
+        Args:
+            arr (np.ndarray): Array to recycle.
+        """
+        if arr.nbytes > self._BUFFER_POOL_MAX_BYTES:
+            return
+        key = (arr.shape, arr.dtype)
+        with self._buffer_pool_lock:
+            bucket = self._buffer_pool.get(key)
+            if bucket is None:
+                bucket = self._buffer_pool[key] = deque()
+            else:
+                self._buffer_pool.move_to_end(key)
+            if len(bucket) >= self._buffer_pool_size:
+                return
+            bucket.append(arr)
+            self._buffer_pool_bytes += arr.nbytes
+            while self._buffer_pool_bytes > self._BUFFER_POOL_MAX_BYTES:
+                stale_key, stale_bucket = next(iter(self._buffer_pool.items()))
+                self._buffer_pool_bytes -= stale_bucket.popleft().nbytes
+                if not stale_bucket:
+                    del self._buffer_pool[stale_key]
+
+    def _select_active_channels(self, data, rdr, active_channels):
+        """Selects active channel rows of a cached all-channel array.
+
+        Args:
+            data (np.ndarray): Segment data for all reader channels.
+            rdr (MefReader): Reader the data was loaded from.
+            active_channels (list): Channel names to select, in output order.
+
+        Returns:
+            tuple: (array, pooled) where ``pooled`` is True if the array came from the buffer pool
+                and must be handed back via ``release_buffer``.
+        """
+        all_channels = list(rdr.channels)
+        if active_channels == all_channels:
+            return data, False
+        channel_indices = [all_channels.index(ch) for ch in active_channels]
+        out = self.acquire_buffer((len(channel_indices), data.shape[1]), data.dtype)
+        # mode='clip' lets take write straight into ``out``; 'raise' would go through a temporary
+        np.take(data, channel_indices, axis=0, out=out, mode='clip')
+        return out, True
+
+    def _coalesce_group_size(self, rdr, seconds):
+        """Number of consecutive segments a prefetch may read with a single ``get_data`` call.
+
+        Short segments are read in groups spanning about ``_COALESCE_READ_S`` so the MEF blocks
+        they share are decompressed once. Grouping is only used when segment boundaries fall on
+        whole samples; otherwise slicing one long read would not reproduce per-segment reads.
+
+        Args:
+            rdr (MefReader): Reader of the file.
+            seconds (float): Segment duration in seconds.
+
+        Returns:
+            int: Group size (1 disables coalescing).
+        """
+        fs = set(rdr.get_property('fsamp'))
+        if len(fs) != 1 or seconds <= 0:
+            return 1
+        if not float(seconds * fs.pop()).is_integer():
+            return 1
+        group_size = int(np.ceil(self._COALESCE_READ_S / seconds))
+        # Bulk-inserted segments have not been read yet; keep a group within a third of the cache
+        # (the hot segment of a TieredCache) so one insert does not flush the prefetch window
+        return max(1, min(group_size, self.cache_capacity // 3))
+
+    def _update_readahead(self, state, chunk_idx):
+        """Tracks the access direction of a file and returns its prefetch window.
+
+        Two or more consecutive steps in the same direction switch to sequential mode, where the
+        distance ahead doubles on every further step up to ``_max_readahead`` (like Linux
+        readahead). Repeated requests for the last index (e.g. several clients paging through the
+        file together) keep the current window; any other access resets it to ``n_prefetch``.
+        Assumes the shard lock is held.
+
+        Args:
+            state (dict): Internal state of the file.
+            chunk_idx (int): Index of the segment being requested.
+
+        Returns:
+            tuple: Number of segments to prefetch (before, after) ``chunk_idx``.
+        """
+        last = state['last_chunk_idx']
+        if chunk_idx != last:
+            step = chunk_idx - last if last is not None else 0
+            if step in (1, -1) and step == state['seq_dir']:
+                state['seq_run'] += 1
+            elif step in (1, -1):
+                state['seq_dir'] = step
+                state['seq_run'] = 1
+            else:
+                state['seq_dir'] = 0
+                state['seq_run'] = 0
+            state['last_chunk_idx'] = chunk_idx
+
+            if state['seq_run'] >= 2:
+                state['readahead'] = min(max(state['readahead'], 1) * 2, self._max_readahead)
+            else:
+                state['readahead'] = self.n_prefetch
+
+        if state['seq_dir'] == 1:
+            return self.n_prefetch, state['readahead']
+        if state['seq_dir'] == -1:
+            return state['readahead'], self.n_prefetch
+        return self.n_prefetch, self.n_prefetch
+
+    def _submit_prefetch(self, state, file_path, chunk_idx):
+        """Queues a background load of a chunk and tracks its future. Assumes the shard lock is held.
+
+        Args:
+            state (dict): Internal state of the file.
+            file_path (str): Path to the MEF file.
+            chunk_idx (int): Index of the chunk to load and cache.
+        """
+        future = self._prefetch_executor.submit(self._load_and_cache_chunk, file_path, chunk_idx)
+        pending = state['prefetch_futures']
+        pending.add(future)
+        # The callback may run right here (future already done), so it must not take the shard lock
+        future.add_done_callback(pending.discard)
+
+    def _cancel_prefetches(self, state):
+        """Cancels prefetches of a file that have not started yet. Assumes the shard lock is held.
+
+        Args:
+            state (dict): Internal state of the file.
+        """
+        for future in list(state['prefetch_futures']):
+            future.cancel()
+        state['prefetch_futures'] = set()
 
     # --- NEW: Helper method for background loading ---
     def _load_and_cache_chunk(self, file_path, chunk_idx):
-        """Worker function to load a single chunk and put it in the cache.
+        """Worker function to load a chunk and put it in the cache.
+
+        When short segments are coalesced (see ``_coalesce_group_size``), the contiguous run of
+        uncached segments in the chunk's group is read in one call and bulk-inserted.
 
         Args:
             file_path (str): Path to the MEF file.
             chunk_idx (int): Index of the chunk to load and cache.
         """
+        files, lock = self._shard_for(file_path)
         # Minimize lock duration - only check and mark as in-progress
-        with self._lock:
+        with lock:
             # Check if file is still open and chunk isn't already cached
-            if file_path not in self._files:
+            if file_path not in files:
                 return
             
-            state = self._files[file_path]
+            state = files[file_path]
             cache = state['cache']
             
             # Quick check: already cached or invalid index
@@ -89,38 +288,73 @@ class FileManager:
                 return
             
             # --- In-progress event tracking ---
-            in_progress = self._in_progress.setdefault(file_path, {})
+            in_progress = state['in_progress']
             if chunk_idx in in_progress:
                 # Already being prefetched
                 return
-            
-            # Mark as in progress
+
+            # Extend to the contiguous run of free segments within the chunk's group
+            group_size = state['group_size']
+            group_start = (chunk_idx // group_size) * group_size
+            group_end = min(group_start + group_size, len(chunks))
+            first = chunk_idx
+            while first > group_start and (first - 1) not in cache and (first - 1) not in in_progress:
+                first -= 1
+            last = chunk_idx
+            while last + 1 < group_end and (last + 1) not in cache and (last + 1) not in in_progress:
+                last += 1
+            run = range(first, last + 1)
+
+            # Mark as in progress (one event shared by the whole run)
             event = threading.Event()
-            in_progress[chunk_idx] = event
+            for idx in run:
+                in_progress[idx] = event
             
             # Get references we need (outside lock, these are safe to use)
             rdr = state['reader']
-            chunk_info = chunks[chunk_idx]
+            run_chunks = [chunks[idx] for idx in run]
 
         # --- Data reading happens outside the main lock ---
         try:
             channels = rdr.channels
-            data = rdr.get_data(channels, chunk_info['start'], chunk_info['end'])
+            span_start = run_chunks[0]['start']
+            span_end = run_chunks[-1]['end']
+            data = rdr.get_data(channels, span_start, span_end)
             data = np.array(data)
 
-            # --- Put loaded data into the cache ---
-            with self._lock:
-                if file_path in self._files and self._files[file_path]['cache'] is cache:
-                    cache.put(chunk_idx, data)
-                    logger.debug(f"Cache PREFETCHED: chunk {chunk_idx} for {file_path}")
+            if len(run) == 1:
+                loaded = {chunk_idx: data}
+            else:
+                fs = rdr.get_property('fsamp', channels[0])
+                bounds = [
+                    (round((int(c['start']) - int(span_start)) * fs / 1e6),
+                     round((int(c['end']) - int(span_start)) * fs / 1e6))
+                    for c in run_chunks
+                ]
+                if bounds[-1][1] == data.shape[1]:
+                    # Copy so each cached segment can be evicted independently of the span
+                    loaded = {idx: data[:, b0:b1].copy() for idx, (b0, b1) in zip(run, bounds)}
+                else:
+                    logger.debug(f"Span read for chunks {first}-{last} of {file_path} is not sample-aligned, "
+                                 f"reading chunk {chunk_idx} alone")
+                    info = run_chunks[chunk_idx - first]
+                    loaded = {chunk_idx: np.asarray(rdr.get_data(channels, info['start'], info['end']))}
+
+            # --- Put loaded data into the cache (farthest first, so the requested chunk is freshest) ---
+            with lock:
+                if file_path in files and files[file_path]['cache'] is cache:
+                    for idx in sorted(loaded, key=lambda k: -abs(k - chunk_idx)):
+                        cache.put(idx, loaded[idx])
+                    logger.debug(f"Cache PREFETCHED: chunks {sorted(loaded)} for {file_path}")
         except Exception as e:
             logger.error(f"Error prefetching chunk {chunk_idx} for {file_path}: {e}")
         finally:
             # Signal completion and cleanup
-            with self._lock:
+            with lock:
                 event.set()
-                if self._in_progress.get(file_path) is in_progress:
-                    in_progress.pop(chunk_idx, None)
+                # A reset in the meantime swapped in a fresh dict; popping from the old one is harmless
+                for idx in run:
+                    in_progress.pop(idx, None)
 
     def open_file(self, file_path):
         """Opens a MEF file and initializes its state.
@@ -131,6 +365,7 @@ class FileManager:
         Returns:
             FileInfoResponse: Protobuf response with file info and open status.
         """
+        files, lock = self._shard_for(file_path)
         actual_path = get_actual_file_path(file_path)
         if not os.path.exists(actual_path):
             logger.warning(f"Attempted to open non-existent file: {file_path}")
@@ -139,20 +374,31 @@ class FileManager:
                 file_opened=False,
                 error_message=f"File does not exist: {file_path}"
             )
-        with self._lock:
-            if file_path in self._files:
+        with lock:
+            if file_path in files:
                 # File is already open, return info with error message
                 info = self._get_file_info_unsafe(file_path)
                 info.error_message = f"File already open: {file_path}"
                 return info
             try:
                 rdr = MefReader(actual_path)
-                self._files[file_path] = {
+                files[file_path] = {
                     'reader': rdr,
                     'chunks': [],
                     'chunk_duration_s': 0,
-                    # --- NEW: Initialize a dedicated LRUCache for this file ---
-                    'cache': LRUCache(capacity=self.cache_capacity)
+                    # --- NEW: Initialize a dedicated segment cache for this file ---
+                    'cache': self._cache_class(capacity=self.cache_capacity),
+                    # In-progress prefetches: {chunk_idx: threading.Event}
+                    'in_progress': {},
+                    # Submitted, not yet finished prefetch futures (cancelled on cache reset)
+                    'prefetch_futures': set(),
+                    # Segments read together by one prefetch (see _coalesce_group_size)
+                    'group_size': 1,
+                    # Access-direction tracking for sequential readahead (see _update_readahead)
+                    'last_chunk_idx': None,
+                    'seq_dir': 0,
+                    'seq_run': 0,
+                    'readahead': self.n_prefetch,
                 }
                 logger.info(f"Opened file: {file_path}")
             except Exception as e:
@@ -164,11 +410,11 @@ class FileManager:
                 )
 
             # Prefetch initial chunks if chunks are already set (e.g., re-opening)
-            state = self._files[file_path]
+            state = files[file_path]
             if state['chunks']:
                 num_to_prefetch = min(self.n_prefetch + 1, len(state['chunks']))
                 for idx in range(num_to_prefetch):
-                    self._prefetch_executor.submit(self._load_and_cache_chunk, file_path, idx)
+                    self._submit_prefetch(state, file_path, idx)
 
             return self._get_file_info_unsafe(file_path)
 
@@ -181,19 +427,20 @@ class FileManager:
         Yields:
             SignalChunk: Protobuf message containing a chunk of signal data.
         """
+        files, lock = self._shard_for(file_path)
         try:
-            with self._lock:
-                if file_path not in self._files:
+            with lock:
+                if file_path not in files:
                     yield gRPCMef3Server_pb2.SignalChunk(
                         file_path=file_path,
                         error_message=f"File not open: {file_path}"
                     )
                     return
-                state = self._files[file_path]
+                state = files[file_path]
                 rdr = state['reader']
                 chunks = state['chunks']
                 cache = state['cache']
-                in_progress = self._in_progress.setdefault(file_path, {})
+                in_progress = state['in_progress']
                 if not chunks:
                     yield gRPCMef3Server_pb2.SignalChunk(
                         file_path=file_path,
@@ -212,28 +459,26 @@ class FileManager:
             # --- PREFETCHING: Submit background tasks to load neighbors FIRST (before waiting) ---
             # This ensures prefetching happens eagerly, even before we need the current chunk
             # Batch check all neighbors in one lock acquisition to reduce contention
-            with self._lock:
-                for i in range(1, self.n_prefetch + 1):
+            # The window widens in the direction of travel during sequential access
+            with lock:
+                n_before, n_after = self._update_readahead(state, chunk_idx)
+                for i in range(1, max(n_before, n_after) + 1):
                     neighbor_before = chunk_idx - i
                     neighbor_after = chunk_idx + i
-                    if neighbor_before >= 0 and neighbor_before not in cache and neighbor_before not in in_progress:
-                        self._prefetch_executor.submit(self._load_and_cache_chunk, file_path, neighbor_before)
-                    if neighbor_after < len(chunks) and neighbor_after not in cache and neighbor_after not in in_progress:
-                        self._prefetch_executor.submit(self._load_and_cache_chunk, file_path, neighbor_after)
+                    if i <= n_before and neighbor_before >= 0 and neighbor_before not in cache and neighbor_before not in in_progress:
+                        self._submit_prefetch(state, file_path, neighbor_before)
+                    if i <= n_after and neighbor_after < len(chunks) and neighbor_after not in cache and neighbor_after not in in_progress:
+                        self._submit_prefetch(state, file_path, neighbor_after)
             
             data = cache.get(chunk_idx)
+            selected = False  # True once data holds only the active channels, in order
             if data is not None:
                 # --- CACHE HIT ---
                 logger.debug(f"Cache HIT: chunk {chunk_idx} for {file_path}")
-                # Filter data to only active channels if needed
-                if 'active_channels' in state and state['active_channels'] is not None:
-                    all_channels = list(rdr.channels)
-                    channel_indices = [all_channels.index(ch) for ch in active_channels]
-                    data = data[channel_indices, :]
             else:
                 # --- Check if prefetch is in progress ---
                 wait_event = None
-                with self._lock:
+                with lock:
                     if chunk_idx in in_progress:
                         wait_event = in_progress[chunk_idx]
                 if wait_event is not None:
@@ -243,11 +488,6 @@ class FileManager:
                     data = cache.get(chunk_idx)
                     if data is not None:
                         logger.debug(f"Cache HIT after wait: chunk {chunk_idx} for {file_path}")
-                        # Filter data to only active channels if needed
-                        if 'active_channels' in state and state['active_channels'] is not None:
-                            all_channels = list(rdr.channels)
-                            channel_indices = [all_channels.index(ch) for ch in active_channels]
-                            data = data[channel_indices, :]
                     else:
                         logger.warning(f"Prefetch failed for chunk {chunk_idx} for {file_path}, loading from disk.")
                 if data is None:
@@ -255,9 +495,13 @@ class FileManager:
                     # --- CACHE MISS (not in progress or prefetch failed) ---
                     try:
                         chunk_info = chunks[chunk_idx]
+                        # Decode only the active channels so miss latency does not grow with the file's
+                        # channel count. The cache holds all-channel segments, so a subset is not cached.
                         data = rdr.get_data(active_channels, chunk_info['start'], chunk_info['end'])
                         data = np.array(data)
-                        cache.put(chunk_idx, data)
+                        selected = active_channels != list(rdr.channels)
+                        if not selected:
+                            cache.put(chunk_idx, data)
                     except Exception as e:
                         logger.error(f"Error loading chunk {chunk_idx} for {file_path}: {e}")
                         yield gRPCMef3Server_pb2.SignalChunk(
@@ -266,39 +510,48 @@ class FileManager:
                         )
                         return
 
-            # --- Dynamic chunking for ~2.5MB ---
-            shape = list(data.shape)
-            num_channels = shape[0]
-            dtype_size = np.dtype('float64').itemsize
-            max_bytes = int(2.5 * 1024 * 1024)  # 2.5MB
-            samples_per_chunk = max(int(max_bytes / (num_channels * dtype_size)), 1)
-            total_samples = shape[1]
-            chunk_info = chunks[chunk_idx]
-            chunk_start = int(chunk_info['start'])
-            chunk_end = int(chunk_info['end'])
-
-            if active_channels:
-                fs = rdr.get_property('fsamp', active_channels[0])
+            # Filter data to only active channels; a pooled buffer is released once streaming ends
+            if selected:
+                pooled = False
             else:
-                fs = rdr.get_property('fsamp')[0]
-
-            for start in range(0, total_samples, samples_per_chunk):
-                end = min(start + samples_per_chunk, total_samples)
-                tile = data[:, start:end]
-                # Calculate tile start/end timestamps
-                tile_start = chunk_start + int((start / total_samples) * (chunk_end - chunk_start))
-                tile_end = chunk_start + int((end / total_samples) * (chunk_end - chunk_start))
-                yield gRPCMef3Server_pb2.SignalChunk(
-                    file_path=file_path,
-                    array_bytes=tile.tobytes(),
-                    dtype='float64',
-                    shape=list(tile.shape),
-                    start_uutc=tile_start,
-                    end_uutc=tile_end,
-                    fs=fs,
-                    channel_names=active_channels,
-                    error_message=""
-                )
+                data, pooled = self._select_active_channels(data, rdr, active_channels)
+            try:
+                # --- Dynamic chunking for ~2.5MB ---
+                shape = list(data.shape)
+                num_channels = shape[0]
+                dtype_size = np.dtype('float64').itemsize
+                max_bytes = int(2.5 * 1024 * 1024)  # 2.5MB
+                samples_per_chunk = max(int(max_bytes / (num_channels * dtype_size)), 1)
+                total_samples = shape[1]
+                chunk_info = chunks[chunk_idx]
+                chunk_start = int(chunk_info['start'])
+                chunk_end = int(chunk_info['end'])
+
+                if active_channels:
+                    fs = rdr.get_property('fsamp', active_channels[0])
+                else:
+                    fs = rdr.get_property('fsamp')[0]
+
+                for start in range(0, total_samples, samples_per_chunk):
+                    end = min(start + samples_per_chunk, total_samples)
+                    tile = data[:, start:end]
+                    # Calculate tile start/end timestamps
+                    tile_start = chunk_start + int((start / total_samples) * (chunk_end - chunk_start))
+                    tile_end = chunk_start + int((end / total_samples) * (chunk_end - chunk_start))
+                    yield gRPCMef3Server_pb2.SignalChunk(
+                        file_path=file_path,
+                        array_bytes=tile.tobytes(),
+                        dtype='float64',
+                        shape=list(tile.shape),
+                        start_uutc=tile_start,
+                        end_uutc=tile_end,
+                        fs=fs,
+                        channel_names=active_channels,
+                        error_message=""
+                    )
+            finally:
+                if pooled:
+                    self.release_buffer(data)
         except Exception as e:
             logger.error(f"Unexpected error in get_signal_segment: {e}")
             yield gRPCMef3Server_pb2.SignalChunk(
@@ -315,7 +568,7 @@ class FileManager:
     # ... (rest of the FileManager methods: _get_file_info_unsafe, close_file, etc. remain the same) ...
     # Make sure to also add a shutdown method.
     def _get_file_info_unsafe(self, file_path):
-        """Internal helper to get file info. Assumes lock is already held.
+        """Internal helper to get file info. Assumes the file's shard lock is already held.
 
         Args:
             file_path (str): Path to the MEF file.
@@ -323,13 +576,14 @@ class FileManager:
         Returns:
             FileInfoResponse: Protobuf response with file info and open status.
         """
-        if file_path not in self._files:
+        files, _ = self._shard_for(file_path)
+        if file_path not in files:
             return gRPCMef3Server_pb2.FileInfoResponse(
                 file_path=file_path,
                 file_opened=False
             )
 
-        state = self._files[file_path]
+        state = files[file_path]
         rdr = state['reader']
         fs = rdr.get_property('fsamp')
         ch_names = rdr.channels
@@ -358,13 +612,13 @@ class FileManager:
         Returns:
             FileInfoResponse: Protobuf response indicating the file is closed.
         """
-        with self._lock:
+        files, lock = self._shard_for(file_path)
+        with lock:
             try:
-                if file_path in self._files:
+                if file_path in files:
                     # Clean up resources if necessary (e.g., rdr.close())
-                    del self._files[file_path]
-                    # Clean up in-progress events for this file
-                    self._in_progress.pop(file_path, None)
+                    self._cancel_prefetches(files[file_path])
+                    del files[file_path]
                     logger.info(f"Closed and removed file: {file_path}")
                 return gRPCMef3Server_pb2.FileInfoResponse(
                     file_path=file_path,
@@ -388,7 +642,8 @@ class FileManager:
         Returns:
             FileInfoResponse: Protobuf response with file info and open status.
         """
-        with self._lock:
+        files, lock = self._shard_for(file_path)
+        with lock:
             try:
                 return self._get_file_info_unsafe(file_path)
             except Exception as e:
@@ -409,8 +664,9 @@ class FileManager:
         Returns:
             SetSignalSegmentResponse: Protobuf response with the number of segments.
         """
-        with self._lock:
-            if file_path not in self._files:
+        files, lock = self._shard_for(file_path)
+        with lock:
+            if file_path not in files:
                 logger.warning(f"set_signal_segment_size: file not open: {file_path}")
                 return gRPCMef3Server_pb2.SetSignalSegmentResponse(
                     file_path=file_path,
@@ -419,7 +675,7 @@ class FileManager:
                 )
 
             try:
-                state = self._files[file_path]
+                state = files[file_path]
                 rdr = state['reader']
                 start_uutc = min(rdr.get_property('start_time'))
                 end_uutc = max(rdr.get_property('end_time'))
@@ -435,8 +691,14 @@ class FileManager:
                     else:
                         last_start = start_uutc
                     segments.append({'start': last_start, 'end': end_uutc})
-                state['cache'] = LRUCache(capacity=self.cache_capacity)
-                self._in_progress.pop(file_path, None)
+                self._cancel_prefetches(state)
+                state['cache'] = self._cache_class(capacity=self.cache_capacity)
+                state['in_progress'] = {}
+                state['group_size'] = self._coalesce_group_size(rdr, seconds)
+                state['last_chunk_idx'] = None
+                state['seq_dir'] = 0
+                state['seq_run'] = 0
+                state['readahead'] = self.n_prefetch
                 state['chunk_duration_s'] = seconds
                 state['chunks'] = segments
                 if segments:
@@ -444,7 +706,7 @@ class FileManager:
                     # Eagerly prefetch the first n_prefetch chunks
                     num_to_prefetch = min(self.n_prefetch + 1, len(segments))
                     for idx in range(num_to_prefetch):
-                        self._prefetch_executor.submit(self._load_and_cache_chunk, file_path, idx)
+                        self._submit_prefetch(state, file_path, idx)
 
                 return gRPCMef3Server_pb2.SetSignalSegmentResponse(
                     file_path=file_path,
@@ -459,6 +721,29 @@ class FileManager:
                     error_message=str(e)
                 )
 
+    def clear_cache(self, file_path):
+        """Drops all cached segments for a file, keeping it open with its segment layout.
+
+        Queued prefetches are cancelled. Ones already running are not interrupted: their
+        results are discarded, but they keep their worker busy until the read completes.
+
+        Args:
+            file_path (str): Path to the MEF file.
+
+        Returns:
+            bool: True if the file was open and its cache was cleared, False otherwise.
+        """
+        files, lock = self._shard_for(file_path)
+        with lock:
+            state = files.get(file_path)
+            if state is None:
+                return False
+            self._cancel_prefetches(state)
+            state['cache'] = self._cache_class(capacity=self.cache_capacity)
+            state['in_progress'] = {}
+            logger.debug(f"Cleared segment cache for {file_path}")
+            return True
+
     def get_number_of_segments(self, file_path):
         """Returns the number of signal segments currently configured for a file.
 
@@ -469,8 +754,9 @@ class FileManager:
             int: Number of segments, or 0 if the file is not open or no segment
                 size has been set.
         """
-        with self._lock:
-            state = self._files.get(file_path)
+        files, lock = self._shard_for(file_path)
+        with lock:
+            state = files.get(file_path)
             if state is None:
                 return 0
             return len(state.get('chunks', []))
@@ -481,18 +767,24 @@ class FileManager:
         Returns:
             list: List of file paths for open files.
         """
-        with self._lock:
-            return list(self._files.keys())
+        # Shards are visited one at a time, so the result is only weakly consistent
+        # with opens/closes happening concurrently.
+        open_files = []
+        for files, lock in self._shards:
+            with lock:
+                open_files.extend(files.keys())
+        return open_files
 
     def set_active_channels(self, file_path, channel_names):
-        with self._lock:
-            if file_path not in self._files:
+        files, lock = self._shard_for(file_path)
+        with lock:
+            if file_path not in files:
                 return gRPCMef3Server_pb2.SetActiveChannelsResponse(
                     file_path=file_path,
                     active_channels=[],
                     error_message=f"File not open: {file_path}"
                 )
-            state = self._files[file_path]
+            state = files[file_path]
             rdr = state['reader']
             all_channels = set(rdr.channels)
             requested = list(channel_names)
@@ -524,14 +816,15 @@ class FileManager:
             )
 
     def get_active_channels(self, file_path):
-        with self._lock:
-            if file_path not in self._files:
+        files, lock = self._shard_for(file_path)
+        with lock:
+            if file_path not in files:
                 return gRPCMef3Server_pb2.GetActiveChannelsResponse(
                     file_path=file_path,
                     active_channels=[],
                     error_message=f"File not open: {file_path}"
                 )
-            state = self._files[file_path]
+            state = files[file_path]
             active = state.get('active_channels')
             if active is None:
                 # Default to all channels
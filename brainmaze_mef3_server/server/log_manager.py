@@ -1,42 +1,158 @@
+import atexit
 import logging
+import logging.handlers
 import os
-from datetime import datetime
+import queue
+import time
+
+# Background listener draining the log queue; kept so it can be stopped on reload/shutdown.
+_listener = None
+# (log_dir, log_level, log_file, queue_handler) of the active setup; makes repeated calls idempotent.
+_last_config = None
+
+
+class CachedTimeFormatter(logging.Formatter):
+    """Formatter that renders the ``asctime`` timestamp once per second.
+
+    ``time.localtime`` + ``strftime`` are only evaluated when a record falls into a new
+    whole second; the milliseconds are appended per record as in ``logging.Formatter``.
+    """
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        # (integer second, datefmt, rendered string) stored as one tuple so reads are atomic
+        self._cached = (None, None, None)
+
+    def formatTime(self, record, datefmt=None):
+        ts = int(record.created)
+        cached_ts, cached_fmt, cached_str = self._cached
+        if ts != cached_ts or datefmt != cached_fmt:
+            cached_str = time.strftime(datefmt or self.default_time_format, self.converter(ts))
+            self._cached = (ts, datefmt, cached_str)
+        if datefmt:
+            return cached_str
+        return self.default_msec_format % (cached_str, record.msecs)
+
 
 def setup_logging(log_dir, log_level=logging.INFO):
     """Setup logging with both file and console handlers.
-    
+
+    Records are pushed onto an in-memory queue by a ``QueueHandler`` attached to the
+    root logger and written to the file/console handlers by a single background
+    ``QueueListener`` thread, so request threads never block on log I/O.
+
+    Repeated calls for the same directory reuse the running handlers (only the level is
+    updated); otherwise the previous handlers are stopped and closed before new ones are set up.
+
     Args:
         log_dir (str): Directory to store log files.
         log_level (int): Logging level (e.g., logging.INFO, logging.DEBUG).
-    
+
     Returns:
-        str: Path to the log file.
+        tuple: Path to the log file and the running ``QueueListener``.
     """
+    global _listener, _last_config
+
+    root_logger = logging.getLogger()
+    config_dir = os.path.abspath(log_dir)
+    if (_listener is not None and _last_config is not None and _last_config[0] == config_dir
+            and _last_config[3] in root_logger.handlers):
+        _, last_level, log_file, queue_handler = _last_config
+        if last_level != log_level:
+            root_logger.setLevel(log_level)
+            _last_config = (config_dir, log_level, log_file, queue_handler)
+            root_logger.info(f"Logging level changed to {logging.getLevelName(log_level)}")
+        return log_file, _listener
+
     os.makedirs(log_dir, exist_ok=True)
-    timestamp = datetime.now().strftime('%Y-%m-%dT%H-%M-%S')
+    timestamp = time.strftime('%Y-%m-%dT%H-%M-%S')
     log_file = os.path.join(log_dir, f'server_{timestamp}.log')
     log_format = '%(asctime)s %(levelname)s [%(threadName)s] %(name)s: %(message)s'
-    
-    root_logger = logging.getLogger()
-    # Remove all handlers first (for repeated tests/reloads)
+    # Skip per-record thread/process lookups in LogRecord.__init__ when the format does not use them
+    logging.logThreads = '%(thread' in log_format
+    logging.logProcesses = '%(process' in log_format
+
+    # Stop the previous listener (flushes pending records and closes its handlers)
+    stop_logging()
+    # Remove all handlers first (for repeated tests/reloads); close them so file descriptors are released
     for h in root_logger.handlers[:]:
+        h.close()
         root_logger.removeHandler(h)
-    
+
     # File handler
     file_handler = logging.FileHandler(log_file)
-    file_handler.setFormatter(logging.Formatter(log_format))
-    root_logger.addHandler(file_handler)
-    
+    file_handler.setFormatter(CachedTimeFormatter(log_format))
+
     # Console handler (for stdout)
     console_handler = logging.StreamHandler()
-    console_handler.setFormatter(logging.Formatter(log_format))
-    root_logger.addHandler(console_handler)
-    
+    console_handler.setFormatter(CachedTimeFormatter(log_format))
+
+    # Only the queue handler lives on the root logger; the listener thread does the I/O
+    log_queue = queue.Queue(-1)
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    root_logger.addHandler(queue_handler)
+    _listener = logging.handlers.QueueListener(
+        log_queue, file_handler, console_handler, respect_handler_level=True
+    )
+    _listener.start()
+    _last_config = (config_dir, log_level, log_file, queue_handler)
+
     root_logger.setLevel(log_level)
-    
+
     root_logger.info(f"Logging initialized. Log file: {log_file}, Level: {logging.getLevelName(log_level)}")
-    
-    return log_file
+
+    return log_file, _listener
+
+
+def stop_logging():
+    """Stop the background log listener, flushing any queued records, and close its handlers.
+
+    The queue handler installed by ``setup_logging`` is detached from the root logger first,
+    so later records are not queued where nothing drains them.
+    Safe to call multiple times or when logging was never set up.
+    """
+    global _listener, _last_config
+    if _last_config is not None:
+        queue_handler = _last_config[3]
+        logging.getLogger().removeHandler(queue_handler)
+        queue_handler.close()
+    if _listener is not None:
+        _listener.stop()
+        for h in _listener.handlers:
+            h.close()
+        _listener = None
+    _last_config = None
+
+
+def _restart_listener_after_fork():
+    """Give a forked child its own log queue and listener thread.
+
+    The listener thread does not survive ``fork``, so without this the child would keep
+    queuing records that are never written. Records still queued at fork time are the
+    parent's to write and are left behind.
+    """
+    global _listener, _last_config
+    if _listener is None or _last_config is None:
+        return
+    config_dir, log_level, log_file, old_queue_handler = _last_config
+    log_queue = queue.Queue(-1)
+    queue_handler = logging.handlers.QueueHandler(log_queue)
+    root_logger = logging.getLogger()
+    if old_queue_handler in root_logger.handlers:
+        root_logger.removeHandler(old_queue_handler)
+        root_logger.addHandler(queue_handler)
+    _listener = logging.handlers.QueueListener(
+        log_queue, *_listener.handlers, respect_handler_level=True
+    )
+    _listener.start()
+    _last_config = (config_dir, log_level, log_file, queue_handler)
+
+
+if hasattr(os, 'register_at_fork'):
+    os.register_at_fork(after_in_child=_restart_listener_after_fork)
+# Drain queued records on a normal exit or an unhandled exception, not only on SIGTERM
+atexit.register(stop_logging)
+
 
 def get_logger(name: str):
     """Get a logger instance for the given name.
@@ -16,7 +16,7 @@ def _init_logging():
     config = read_app_config()
     log_level = get_log_level_from_config(config)
     log_dir = os.path.join(os.path.dirname(os.path.abspath(__file__)), '../../logs')
-    log_file = setup_logging(log_dir, log_level)
+    log_file, _ = setup_logging(log_dir, log_level)
     print(f"Logging to: {log_file}")
     return log_file
 
@@ -32,13 +32,67 @@ def mef3_file():
 
         start_uutc = int(np.round(datetime.datetime.now().timestamp() * 1e6))
 
+        # One reusable float32 buffer refilled per channel instead of a fresh float64 array each time
+        rng = np.random.default_rng()
+        x = np.empty(fs*duration_s, dtype=np.float32)
         for ch in channel_names:
-            x = np.random.randn(fs*duration_s)
+            rng.standard_normal(out=x, dtype=np.float32)
             wrt.write_data(x, ch, start_uutc=start_uutc, sampling_freq=fs, precision=3, discont_handler=False)
 
         yield file_path
 
 
+# --- Session-scoped FileManager fixtures -------------------------------
+# Benchmark configurations for the in-process FileManager: (n_prefetch, cache_capacity_multiplier, max_workers)
+FM_PREFETCH_CONFIG = (10, 10, 12)
+FM_NO_PREFETCH_CONFIG = (0, 0, 4)
+FM_SEGMENT_SIZE_S = 60
+
+
+@pytest.fixture(scope="session")
+def file_manager_pool(mef3_file):
+    """
+    Session-wide pool of FileManagers with ``mef3_file`` already opened.
+    Yields a getter keyed by ``(n_prefetch, cache_capacity_multiplier, max_workers)`` so
+    MEF headers are parsed once per configuration instead of once per test.
+    """
+    managers = {}
+
+    def _get(n_prefetch, cache_capacity_multiplier, max_workers):
+        key = (n_prefetch, cache_capacity_multiplier, max_workers)
+        if key not in managers:
+            fm = FileManager(n_prefetch, cache_capacity_multiplier, max_workers)
+            fm.open_file(mef3_file)
+            fm.set_signal_segment_size(mef3_file, FM_SEGMENT_SIZE_S)
+            managers[key] = fm
+        return managers[key]
+
+    yield _get
+
+    for fm in managers.values():
+        fm.shutdown()
+
+
+def _session_file_manager(request, pool, mef3_file, config):
+    fm = pool(*config)
+    # Start every test cold unless it explicitly opts into the previous test's cache
+    if request.node.get_closest_marker("warm_cache") is None:
+        fm.clear_cache(mef3_file)
+    return fm
+
+
+@pytest.fixture(scope="function")
+def fm_with_prefetch(request, file_manager_pool, mef3_file):
+    """Session-shared FileManager with prefetching enabled (``FM_PREFETCH_CONFIG``)."""
+    return _session_file_manager(request, file_manager_pool, mef3_file, FM_PREFETCH_CONFIG)
+
+
+@pytest.fixture(scope="function")
+def fm_no_prefetch(request, file_manager_pool, mef3_file):
+    """Session-shared FileManager with prefetching disabled (``FM_NO_PREFETCH_CONFIG``)."""
+    return _session_file_manager(request, file_manager_pool, mef3_file, FM_NO_PREFETCH_CONFIG)
+
+
 # MEF3 test data configuration constants
 MEF3_TEST_CHANNELS = 64
 MEF3_TEST_FS = 256
@@ -123,9 +177,11 @@ def benchmark_mef3_file():
         s = (datetime.datetime.now().timestamp() - 3600*24*MEF3_TEST_START_OFFSET_DAYS) * 1e6
         
         print("\n[Creating benchmark MEF3 file - 2 hours of data]")
+        rng = np.random.default_rng()
+        x = np.empty(MEF3_BENCHMARK_DURATION_S * MEF3_TEST_FS, dtype=np.float32)
         for idx in range(MEF3_TEST_CHANNELS):
             chname = f"chan_{idx+1:03d}"
-            x = np.random.randn(MEF3_BENCHMARK_DURATION_S * MEF3_TEST_FS)
+            rng.standard_normal(out=x, dtype=np.float32)
             wrt.write_data(x, chname, s, MEF3_TEST_FS, precision=MEF3_TEST_PRECISION)
         print("[Benchmark MEF3 file created successfully]")
         
@@ -157,9 +213,11 @@ def functional_test_mef3_file(tmp_path_factory):
     s = (datetime.datetime.now().timestamp() - 3600*24*MEF3_TEST_START_OFFSET_DAYS) * 1e6
     
     print("\n[Creating functional test MEF3 file - 1 hour of data]")
+    rng = np.random.default_rng()
+    x = np.empty(MEF3_FUNCTIONAL_TEST_DURATION_S * MEF3_TEST_FS, dtype=np.float32)
     for idx in range(MEF3_TEST_CHANNELS):
         chname = f"chan_{idx+1:03d}"
-        x = np.random.randn(MEF3_FUNCTIONAL_TEST_DURATION_S * MEF3_TEST_FS)
+        rng.standard_normal(out=x, dtype=np.float32)
         wrt.write_data(x, chname, s, MEF3_TEST_FS, precision=MEF3_TEST_PRECISION)
     print("[Functional test MEF3 file created successfully]")
     
@@ -191,6 +249,21 @@ def launch_server_process():
     time.sleep(1.0)
 
 
+# Workers in ``client_pool``; bounds how many clients one concurrent benchmark round may drive
+CLIENT_POOL_WORKERS = 16
+
+
+@pytest.fixture(scope="session")
+def client_pool():
+    """
+    Persistent thread pool for driving concurrent benchmark clients.
+    Reused across benchmark iterations so thread start-up/teardown is not measured.
+    """
+    pool = futures.ThreadPoolExecutor(max_workers=CLIENT_POOL_WORKERS, thread_name_prefix='benchmark_client')
+    yield pool
+    pool.shutdown(wait=True)
+
+
 # --- Server and Client Fixtures ---------------------------------------
 def create_grpc_server(n_prefetch, cache_capacity_multiplier, max_workers):
     """Factory function to create a gRPC server with specific FileManager settings."""
@@ -3,13 +3,17 @@ Benchmark tests for MEF3 server performance.
 All benchmarks use the same dataset (2 hours, 64 channels, 256 Hz, precision=2)
 and the same number of operations (20 chunks) for fair comparison.
 """
+import asyncio
 import pytest
+import random
 import numpy as np
 import threading
+from concurrent import futures
 from mef_tools import MefReader
 from brainmaze_mef3_server.client import Mef3Client
 
 from .conftest import (
+    CLIENT_POOL_WORKERS,
     MEF3_TEST_FS,
     MEF3_TEST_PRECISION,
     MEF3_BENCHMARK_DURATION_S,
@@ -25,8 +29,13 @@ BENCHMARK_SEGMENT_SIZE_S = 60  # 60 second segments
 ROUNDS = 1
 SLEEP_SECONDS = 0.3 # simulating processing delay
 N_PREFETCH = 1
+NUM_CLIENTS = 5
 MAX_WORKERS = 20
 CACHE_CAPACITY_MULTIPLIER = 30
+RANDOM_SEED = 42
+
+# Shuffled chunk orders keyed by num_chunks; the seed is fixed, so they are computed once
+_RANDOM_INDEX_CACHE = {}
 
 
 # --- Helper functions for access patterns ---
@@ -42,6 +51,66 @@ def grpc_sequential_forward(client, file_path, num_chunks):
 
 
 
+def random_chunk_indices(num_chunks):
+    """Return the fixed-seed shuffled order of the first ``num_chunks`` chunk indices."""
+    indices = _RANDOM_INDEX_CACHE.get(num_chunks)
+    if indices is None:
+        indices = list(range(num_chunks))
+        random.Random(RANDOM_SEED).shuffle(indices)
+        _RANDOM_INDEX_CACHE[num_chunks] = indices
+    return indices
+
+
+def grpc_random_access(client, file_path, indices):
+    """Access chunks in a precomputed random order via gRPC."""
+    for i in indices:
+        _ = client.get_signal_segment(file_path, i)
+        time.sleep(SLEEP_SECONDS)  # Simulate slight processing delay
+
+
+def concurrent_access_pattern(pool, clients, file_path, num_chunks):
+    """
+    Sequential forward access by several clients at once via gRPC.
+    Work is submitted to a persistent pool; a barrier releases all clients together
+    so the first one does not warm the cache before the others contend.
+    """
+    # Every client must hold a worker while waiting at the barrier, or the round deadlocks
+    assert len(clients) <= CLIENT_POOL_WORKERS, "client_pool has fewer workers than clients"
+    barrier = threading.Barrier(len(clients))
+
+    def client_work(client):
+        barrier.wait()
+        grpc_sequential_forward(client, file_path, num_chunks)
+
+    futs = [pool.submit(client_work, client) for client in clients]
+    futures.wait(futs)
+    for f in futs:
+        f.result()  # re-raise worker exceptions
+
+
+async def _async_client_work(client, file_path, num_chunks):
+    """One asyncio client: sequential forward access over a grpc.aio channel."""
+    for i in range(num_chunks):
+        _ = await client.aget_signal_segment(file_path, i)
+        await asyncio.sleep(SLEEP_SECONDS)  # Simulate slight processing delay
+
+
+def async_concurrent_access_pattern(loop, clients, file_path, num_chunks):
+    """
+    Same workload as concurrent_access_pattern, but all clients run as coroutines on a
+    single thread, so the measurement is not affected by client-side GIL contention.
+    """
+    async def _run():
+        await asyncio.gather(*[_async_client_work(client, file_path, num_chunks) for client in clients])
+
+    loop.run_until_complete(_run())
+
+
+async def _aclose_clients(clients):
+    """Release the grpc.aio channels of all clients on the loop that opened them."""
+    await asyncio.gather(*[client.aclose() for client in clients])
+
+
 def direct_mef_reader_access(rdr, num_chunks):
     """
     Read data directly using MefReader (no server, no cache).
@@ -180,3 +249,113 @@ def test_grpc_sequential_forward_no_prefetch(benchmark, benchmark_mef3_file, grp
     client.shutdown()
 
 
+
+
+@pytest.mark.benchmark
+@pytest.mark.parametrize("client_model", ["threads", "asyncio"])
+def test_grpc_concurrent_clients_with_prefetch(benchmark, benchmark_mef3_file, grpc_server_factory, client_pool,
+                                               client_model):
+    """
+    NUM_CLIENTS concurrent clients, each reading sequentially forward via gRPC WITH prefetching.
+    20 chunks, 60s each, per client. Clients run either on pool threads or as asyncio coroutines.
+    """
+    port = grpc_server_factory(n_prefetch=N_PREFETCH, cache_capacity_multiplier=CACHE_CAPACITY_MULTIPLIER, max_workers=MAX_WORKERS)
+    clients = [Mef3Client(f"localhost:{port}") for _ in range(NUM_CLIENTS)]
+
+    # Setup - file state is shared on the server, so configure it once
+    client = clients[0]
+    client.open_file(benchmark_mef3_file)
+    fi = client.get_file_info(benchmark_mef3_file)
+    channels = fi['channel_names']
+    client.set_active_channels(benchmark_mef3_file, channels)
+    client.set_signal_segment_size(benchmark_mef3_file, BENCHMARK_SEGMENT_SIZE_S)
+
+    record_benchmark_setup(
+        benchmark,
+        access=f"gRPC sequential forward WITH prefetch, {NUM_CLIENTS} concurrent clients ({client_model})",
+        file_path=benchmark_mef3_file,
+        total_channels=len(channels),
+        active_channels=len(channels),
+        fs=MEF3_TEST_FS,
+        precision=MEF3_TEST_PRECISION,
+        duration_s=MEF3_BENCHMARK_DURATION_S,
+        num_chunks=BENCHMARK_NUM_CHUNKS,
+        segment_size_s=BENCHMARK_SEGMENT_SIZE_S,
+        rounds=ROUNDS,
+        sleep_seconds=SLEEP_SECONDS,
+        server="gRPC",
+        n_prefetch=N_PREFETCH,
+        cache_capacity_multiplier=CACHE_CAPACITY_MULTIPLIER,
+        prefetch_workers=MAX_WORKERS,
+        grpc_threads=MAX_WORKERS,  # benchmark server uses ThreadPoolExecutor(max_workers)
+    )
+
+    # Benchmark
+    if client_model == "asyncio":
+        # One loop for all rounds so the aio channels are reused
+        loop = asyncio.new_event_loop()
+        try:
+            benchmark.pedantic(
+                async_concurrent_access_pattern,
+                args=(loop, clients, benchmark_mef3_file, BENCHMARK_NUM_CHUNKS),
+                rounds=ROUNDS,
+            )
+        finally:
+            loop.run_until_complete(_aclose_clients(clients))
+            loop.close()
+    else:
+        benchmark.pedantic(
+            concurrent_access_pattern,
+            args=(client_pool, clients, benchmark_mef3_file, BENCHMARK_NUM_CHUNKS),
+            rounds=ROUNDS,
+        )
+
+    # Cleanup
+    client.close_file(benchmark_mef3_file)
+    for c in clients:
+        c.shutdown()
+
+
+@pytest.mark.benchmark
+def test_grpc_random_access_with_prefetch(benchmark, benchmark_mef3_file, grpc_server_factory):
+    """
+    Random access via gRPC WITH prefetching (fixed-seed order, computed outside the timed region).
+    20 chunks, 60s each.
+    """
+    port = grpc_server_factory(n_prefetch=N_PREFETCH, cache_capacity_multiplier=CACHE_CAPACITY_MULTIPLIER, max_workers=MAX_WORKERS)
+    client = Mef3Client(f"localhost:{port}")
+
+    # Setup
+    client.open_file(benchmark_mef3_file)
+    fi = client.get_file_info(benchmark_mef3_file)
+    channels = fi['channel_names']
+    client.set_active_channels(benchmark_mef3_file, channels)
+    client.set_signal_segment_size(benchmark_mef3_file, BENCHMARK_SEGMENT_SIZE_S)
+    indices = random_chunk_indices(BENCHMARK_NUM_CHUNKS)
+
+    record_benchmark_setup(
+        benchmark,
+        access="gRPC random access WITH prefetch",
+        file_path=benchmark_mef3_file,
+        total_channels=len(channels),
+        active_channels=len(channels),
+        fs=MEF3_TEST_FS,
+        precision=MEF3_TEST_PRECISION,
+        duration_s=MEF3_BENCHMARK_DURATION_S,
+        num_chunks=BENCHMARK_NUM_CHUNKS,
+        segment_size_s=BENCHMARK_SEGMENT_SIZE_S,
+        rounds=ROUNDS,
+        sleep_seconds=SLEEP_SECONDS,
+        server="gRPC",
+        n_prefetch=N_PREFETCH,
+        cache_capacity_multiplier=CACHE_CAPACITY_MULTIPLIER,
+        prefetch_workers=MAX_WORKERS,
+        grpc_threads=MAX_WORKERS,  # benchmark server uses ThreadPoolExecutor(max_workers)
+    )
+
+    # Benchmark
+    benchmark.pedantic(grpc_random_access, args=(client, benchmark_mef3_file, indices), rounds=ROUNDS)
+
+    # Cleanup
+    client.close_file(benchmark_mef3_file)
+    client.shutdown()
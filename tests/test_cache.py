@@ -1,6 +1,6 @@
 import pytest
 import threading
-from brainmaze_mef3_server.server.cache import LRUCache
+from brainmaze_mef3_server.server.cache import LRUCache, TieredCache
 
 def test_put_and_get():
     cache = LRUCache(2)
@@ -92,3 +92,66 @@ def test_zero_capacity():
 def test_negative_capacity():
     with pytest.raises(ValueError):
         LRUCache(-1)
+
+
+def test_tiered_put_and_get():
+    cache = TieredCache(3)
+    cache.put('a', 1)
+    assert cache.get('a') == 1
+    assert cache.get('b') is None
+    cache.put('a', 2)
+    assert cache.get('a') == 2
+
+def test_tiered_capacity_bound():
+    cache = TieredCache(5)
+    for i in range(20):
+        cache.put(i, i)
+        assert len(cache) <= 5
+    # Never-accessed items are evicted oldest first
+    assert 0 not in cache
+    assert 19 in cache
+
+def test_tiered_accessed_item_survives_scan():
+    cache = TieredCache(3)
+    cache.put('a', 1)
+    assert cache.get('a') == 1
+    # A strict LRU of capacity 3 would evict 'a' after three new keys
+    for k in ('b', 'c', 'd'):
+        cache.put(k, k)
+    assert cache.get('a') == 1
+    assert 'b' not in cache
+
+def test_tiered_small_capacities():
+    cache = TieredCache(1)
+    cache.put('a', 1)
+    assert cache.get('a') == 1
+    cache.put('b', 2)
+    assert len(cache) == 1
+    assert cache.get('b') == 2
+
+    cache = TieredCache(0)
+    cache.put('a', 1)
+    assert cache.get('a') is None
+    assert len(cache) == 0
+
+def test_tiered_clear_and_negative_capacity():
+    cache = TieredCache(3)
+    cache.put('a', 1)
+    cache.clear()
+    assert 'a' not in cache
+    assert len(cache) == 0
+    with pytest.raises(ValueError):
+        TieredCache(-1)
+
+def test_tiered_thread_safety():
+    cache = TieredCache(6)
+    def worker(offset):
+        for i in range(200):
+            cache.put((offset, i % 10), i)
+            cache.get((offset, (i + 1) % 10))
+    threads = [threading.Thread(target=worker, args=(t,)) for t in range(8)]
+    for t in threads:
+        t.start()
+    for t in threads:
+        t.join()
+    assert len(cache) <= 6
@@ -1,3 +1,5 @@
+import asyncio
+
 import pytest
 import numpy as np
 
@@ -63,3 +65,38 @@ def test_list_and_close(client, mef3_file):
     assert not resp["file_opened"]
     files = client.list_open_files()
     assert mef3_file not in files
+
+def test_aget_signal_segment_matches_sync(client, mef3_file):
+    client.open_file(mef3_file)
+    client.set_signal_segment_size(mef3_file, 60)
+
+    async def _get():
+        try:
+            return await client.aget_signal_segment(mef3_file, 1)
+        finally:
+            await client.aclose()
+
+    meta = asyncio.run(_get())
+    ref = client.get_signal_segment(mef3_file, 1)
+    assert meta["error_message"] == ''
+    assert meta["shape"] == ref["shape"]
+    np.testing.assert_array_equal(meta["array"], ref["array"])
+
+
+def test_aget_signal_segment_rejects_second_open_loop(client, mef3_file):
+    client.open_file(mef3_file)
+    client.set_signal_segment_size(mef3_file, 60)
+    first = asyncio.new_event_loop()
+    second = asyncio.new_event_loop()
+    try:
+        first.run_until_complete(client.aget_signal_segment(mef3_file, 0))
+        with pytest.raises(RuntimeError, match="aclose"):
+            second.run_until_complete(client.aget_signal_segment(mef3_file, 0))
+        first.run_until_complete(client.aclose())
+        # Once released, the client can move to another loop
+        meta = second.run_until_complete(client.aget_signal_segment(mef3_file, 0))
+        assert meta["error_message"] == ''
+        second.run_until_complete(client.aclose())
+    finally:
+        first.close()
+        second.close()
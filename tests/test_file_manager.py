@@ -3,13 +3,21 @@ import numpy as np
 from unittest.mock import patch
 import concurrent.futures
 import os
+import threading
 import time
+import tracemalloc
 
 from brainmaze_mef3_server.server.file_manager import FileManager
 from mef_tools import MefReader
 import brainmaze_mef3_server.protobufs.gRPCMef3Server_pb2 as pb2
 
-from .conftest import mef3_file, record_benchmark_setup
+from .conftest import (
+    mef3_file,
+    record_benchmark_setup,
+    FM_PREFETCH_CONFIG,
+    FM_NO_PREFETCH_CONFIG,
+    FM_SEGMENT_SIZE_S,
+)
 
 
 def test_open_and_close_file(mef3_file):
@@ -49,7 +57,7 @@ def test_get_signal_segment_and_cache(mef3_file):
     fm = FileManager(n_prefetch=1)
     fm.open_file(mef3_file)
     fm.set_signal_segment_size(mef3_file, 0.1)
-    state = fm._files[mef3_file]
+    state = fm._get_state(mef3_file)
 
     # First access: should be a cache miss
     chunks = list(fm.get_signal_segment(mef3_file, 0))
@@ -66,12 +74,12 @@ def test_set_signal_segment_size_resets_cache_state(mef3_file):
 
     first_chunk = list(fm.get_signal_segment(mef3_file, 0))[0]
     first_shape = tuple(first_chunk.shape)
-    assert 0 in fm._files[mef3_file]['cache']
+    assert 0 in fm._get_state(mef3_file)['cache']
 
     fm.set_signal_segment_size(mef3_file, 0.2)
 
-    assert 0 not in fm._files[mef3_file]['cache']
-    assert not fm._in_progress.get(mef3_file)
+    assert 0 not in fm._get_state(mef3_file)['cache']
+    assert not fm._get_state(mef3_file)['in_progress']
 
     second_chunk = list(fm.get_signal_segment(mef3_file, 0))[0]
     assert tuple(second_chunk.shape) != first_shape
@@ -79,7 +87,7 @@ def test_set_signal_segment_size_resets_cache_state(mef3_file):
 def test_set_and_get_active_channels_and_signal(mef3_file):
     fm = FileManager()
     fm.open_file(mef3_file)
-    all_channels = fm._files[mef3_file]['reader'].channels
+    all_channels = fm._get_state(mef3_file)['reader'].channels
     # Select a subset and reorder
     selected = [all_channels[3], all_channels[1], all_channels[5]]
     # Set active channels
@@ -97,18 +105,150 @@ def test_set_and_get_active_channels_and_signal(mef3_file):
     arr = arr.reshape(chunks[0].shape)
     assert arr.shape[0] == len(selected)
     # Check the data matches the reference for those channels and order
-    rdr = fm._files[mef3_file]['reader']
-    chunk_info = fm._files[mef3_file]['chunks'][0]
+    rdr = fm._get_state(mef3_file)['reader']
+    chunk_info = fm._get_state(mef3_file)['chunks'][0]
     ref = rdr.get_data(selected, chunk_info['start'], chunk_info['end'])
     np.testing.assert_array_equal(arr, ref)
 
 
+def test_clear_cache_keeps_segments(mef3_file):
+    fm = FileManager(n_prefetch=0)
+    fm.open_file(mef3_file)
+    resp = fm.set_signal_segment_size(mef3_file, 0.1)
+
+    list(fm.get_signal_segment(mef3_file, 0))
+    assert 0 in fm._get_state(mef3_file)['cache']
+
+    assert fm.clear_cache(mef3_file)
+    assert 0 not in fm._get_state(mef3_file)['cache']
+    assert fm.get_number_of_segments(mef3_file) == resp.number_of_segments
+    assert len(list(fm.get_signal_segment(mef3_file, 0))) > 0
+
+    assert not fm.clear_cache("not_open.mefd")
+    fm.shutdown()
+
+
+def test_clear_cache_cancels_queued_prefetches(mef3_file):
+    fm = FileManager(n_prefetch=0, max_workers=1)
+    fm.open_file(mef3_file)
+    # Occupy the single worker so every prefetch behind it stays queued,
+    # including the eager load of the first segment
+    release = threading.Event()
+    blocker = fm._prefetch_executor.submit(release.wait)
+    # Everything after the blocker must release it, or a failing setup hangs the worker forever
+    try:
+        fm.set_signal_segment_size(mef3_file, 0.1)
+        files, lock = fm._shard_for(mef3_file)
+        with lock:
+            state = files[mef3_file]
+            for chunk_idx in range(1, 4):
+                fm._submit_prefetch(state, mef3_file, chunk_idx)
+            queued = list(state['prefetch_futures'])
+
+        fm.clear_cache(mef3_file)
+        assert not state['prefetch_futures']
+        assert all(f.cancelled() for f in queued)
+    finally:
+        release.set()
+        blocker.result()
+        fm._prefetch_executor.shutdown(wait=True)
+
+
+def test_buffer_pool_reuses_released_arrays():
+    fm = FileManager(n_prefetch=0)
+    buf = fm.acquire_buffer((4, 10), np.float64)
+    assert buf.shape == (4, 10) and buf.dtype == np.float64
+    fm.release_buffer(buf)
+    assert fm.acquire_buffer((4, 10), np.float64) is buf
+    # Different size class allocates a fresh array
+    assert fm.acquire_buffer((3, 10), np.float64) is not buf
+    fm.shutdown()
+
+
+def test_buffer_pool_drops_stale_size_classes_over_byte_cap():
+    fm = FileManager(n_prefetch=0)
+    fm._BUFFER_POOL_MAX_BYTES = 3 * 80 * 8
+    # Each release is a new size class, as after a window size or channel set change
+    for n_samples in (80, 79, 78, 77):
+        fm.release_buffer(np.empty((1, n_samples)))
+    assert fm._buffer_pool_bytes <= fm._BUFFER_POOL_MAX_BYTES
+    assert ((1, 80), np.dtype(np.float64)) not in fm._buffer_pool
+    assert ((1, 77), np.dtype(np.float64)) in fm._buffer_pool
+
+    # Acquiring the last array of a class removes the class
+    fm.acquire_buffer((1, 77), np.float64)
+    assert ((1, 77), np.dtype(np.float64)) not in fm._buffer_pool
+    assert fm._buffer_pool_bytes == sum(a.nbytes for b in fm._buffer_pool.values() for a in b)
+    fm.shutdown()
+
+
+def test_select_active_channels_pooled_path_does_not_allocate():
+    class _Reader:
+        channels = [f'ch{i}' for i in range(8)]
+
+    fm = FileManager(n_prefetch=0)
+    data = np.random.rand(8, 100_000)
+    selected = ['ch5', 'ch1', 'ch3', 'ch0']
+    out, pooled = fm._select_active_channels(data, _Reader, selected)
+    fm.release_buffer(out)
+
+    tracemalloc.start()
+    try:
+        out, pooled = fm._select_active_channels(data, _Reader, selected)
+        _, peak = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    assert pooled
+    np.testing.assert_array_equal(out, data[[5, 1, 3, 0]])
+    # The selection alone is 3.2 MB; only bookkeeping may be allocated
+    assert peak < 64 * 1024
+    fm.shutdown()
+
+
+def test_active_channels_after_cache_miss(mef3_file):
+    fm = FileManager(n_prefetch=0)
+    fm.open_file(mef3_file)
+    rdr = fm._get_state(mef3_file)['reader']
+    selected = [rdr.channels[2], rdr.channels[0]]
+    fm.set_active_channels(mef3_file, selected)
+    fm.set_signal_segment_size(mef3_file, 0.1)
+    chunk_info = fm._get_state(mef3_file)['chunks'][1]
+    ref = np.asarray(rdr.get_data(selected, chunk_info['start'], chunk_info['end']))
+
+    # Miss then hit must both return the selected channels in the requested order
+    for _ in range(2):
+        chunk = list(fm.get_signal_segment(mef3_file, 1))[0]
+        arr = np.frombuffer(chunk.array_bytes, dtype=chunk.dtype).reshape(chunk.shape)
+        np.testing.assert_array_equal(arr, ref)
+    fm.shutdown()
+
+
+def test_cache_miss_reads_only_active_channels(mef3_file):
+    fm = FileManager(n_prefetch=0)
+    fm.open_file(mef3_file)
+    rdr = fm._get_state(mef3_file)['reader']
+    selected = [rdr.channels[1]]
+    fm.set_active_channels(mef3_file, selected)
+    fm.set_signal_segment_size(mef3_file, 0.1)
+    # Let the eager (coalesced) prefetch of the first segments finish, then start cold
+    concurrent.futures.wait(fm._get_state(mef3_file)['prefetch_futures'].copy())
+    fm.clear_cache(mef3_file)
+
+    with patch.object(rdr, 'get_data', wraps=rdr.get_data) as get_data:
+        chunk = list(fm.get_signal_segment(mef3_file, 1))[0]
+    assert [call.args[0] for call in get_data.call_args_list] == [selected]
+    assert chunk.shape[0] == 1
+    # The subset is not cached in place of the all-channel segment
+    assert 1 not in fm._get_state(mef3_file)['cache']
+    fm.shutdown()
+
+
 def test_prefetching_neighbors(mef3_file):
     fm = FileManager(n_prefetch=1)
     fm.open_file(mef3_file)
     # Set segment size which will create valid chunks based on the actual file
     fm.set_signal_segment_size(mef3_file, 0.1)
-    state = fm._files[mef3_file]
+    state = fm._get_state(mef3_file)
     
     # Ensure we have at least 2 chunks to test prefetching
     assert len(state['chunks']) >= 2, "Need at least 2 chunks for this test"
@@ -136,13 +276,119 @@ def test_get_signal_segment_invalid(mef3_file):
     assert result[0].error_message != ""
 
     # Set chunks, but invalid index
-    state = fm._files[mef3_file]
+    state = fm._get_state(mef3_file)
     state['chunks'] = [{'start': 0, 'end': 100}]
     result2 = list(fm.get_signal_segment(mef3_file, 2))
     assert len(result2) == 1
     assert result2[0].error_message != ""
 
 
+def test_coalesced_prefetch_matches_direct_reads(mef3_file):
+    fm = FileManager(n_prefetch=2, cache_capacity_multiplier=30)
+    fm.open_file(mef3_file)
+    fm.set_signal_segment_size(mef3_file, 1)  # 256 samples per segment -> sample-aligned
+    state = fm._get_state(mef3_file)
+    assert state['group_size'] > 1
+    # Let the eager prefetch from set_signal_segment_size finish, then start cold
+    deadline = time.time() + 10
+    while state['in_progress'] and time.time() < deadline:
+        time.sleep(0.01)
+    fm.clear_cache(mef3_file)
+
+    fm._load_and_cache_chunk(mef3_file, 4)
+    rdr = state['reader']
+    cached = [idx for idx in range(state['group_size']) if idx in state['cache']]
+    assert len(cached) > 1, "The whole group should be cached by one prefetch"
+    for idx in cached:
+        info = state['chunks'][idx]
+        ref = np.asarray(rdr.get_data(rdr.channels, info['start'], info['end']))
+        np.testing.assert_array_equal(state['cache'].get(idx), ref)
+    fm.shutdown()
+
+
+def test_unaligned_segments_are_not_coalesced(mef3_file):
+    fm = FileManager(n_prefetch=2, cache_capacity_multiplier=30)
+    fm.open_file(mef3_file)
+    fm.set_signal_segment_size(mef3_file, 0.1)  # 25.6 samples per segment
+    assert fm._get_state(mef3_file)['group_size'] == 1
+    fm.shutdown()
+
+
+def test_sequential_access_grows_readahead(mef3_file):
+    fm = FileManager(n_prefetch=2, cache_capacity_multiplier=30)
+    fm.open_file(mef3_file)
+    fm.set_signal_segment_size(mef3_file, 1)
+    state = fm._get_state(mef3_file)
+
+    assert fm._update_readahead(state, 0) == (2, 2)
+    assert fm._update_readahead(state, 1) == (2, 2)
+    # Second consecutive forward step -> sequential mode, window ahead doubles (capped)
+    assert fm._update_readahead(state, 2) == (2, 4)
+    assert fm._update_readahead(state, 3) == (2, 8)
+    assert fm._update_readahead(state, 4) == (2, 8)
+    # A jump resets to the symmetric window
+    assert fm._update_readahead(state, 40) == (2, 2)
+    # Backward paging grows the window behind
+    fm._update_readahead(state, 39)
+    assert fm._update_readahead(state, 38) == (4, 2)
+    # Let the eager prefetch finish before the session's file can be removed
+    fm._prefetch_executor.shutdown(wait=True)
+
+
+def test_repeated_requests_keep_readahead(mef3_file):
+    fm = FileManager(n_prefetch=2, cache_capacity_multiplier=30)
+    fm.open_file(mef3_file)
+    fm.set_signal_segment_size(mef3_file, 1)
+    state = fm._get_state(mef3_file)
+
+    # Several clients paging together request every index more than once
+    windows = [fm._update_readahead(state, idx) for idx in (0, 0, 0, 1, 1, 1, 2, 2, 2, 3, 3, 3)]
+    assert windows[3:6] == [(2, 2)] * 3
+    assert windows[6:9] == [(2, 4)] * 3
+    assert windows[9:] == [(2, 8)] * 3
+    fm._prefetch_executor.shutdown(wait=True)
+
+
+def _count_cache_hits(fm, file_path, pattern):
+    """Requests segments in order, letting prefetches settle in between; returns how many were cached."""
+    state = fm._get_state(file_path)
+    hits = 0
+    for idx in pattern:
+        concurrent.futures.wait(state['prefetch_futures'].copy())
+        hits += idx in state['cache']
+        list(fm.get_signal_segment(file_path, idx))
+    return hits
+
+
+@pytest.mark.parametrize("pattern", [
+    list(range(16)) + list(range(15, -1, -1)),  # page forward, then back
+    (list(range(10)) + list(range(9, -1, -1))) * 3,  # oscillate
+], ids=["forward_then_back", "oscillate"])
+def test_back_and_forth_paging_hits_cache(mef3_file, pattern):
+    # Server defaults: N_PREFETCH=3, CACHE_CAPACITY_MULTIPLIER=3, MAX_WORKERS=4
+    fm = FileManager(3, 3, 4)
+    fm.open_file(mef3_file)
+    fm.set_signal_segment_size(mef3_file, 10)
+    try:
+        assert _count_cache_hits(fm, mef3_file, pattern) == len(pattern)
+    finally:
+        fm._prefetch_executor.shutdown(wait=True)
+
+
+def test_files_are_sharded_independently(mef3_file, tmp_path):
+    fm = FileManager(n_prefetch=0)
+    fm.open_file(mef3_file)
+    files, lock = fm._shard_for(mef3_file)
+    assert mef3_file in files
+    # Holding this file's shard lock must not block lookups that land in another shard
+    other = next(p for p in (str(tmp_path / f"f{i}.mefd") for i in range(100))
+                 if fm._shard_for(p)[1] is not lock)
+    with lock:
+        assert fm.get_number_of_segments(other) == 0
+    assert fm.list_open_files() == [mef3_file]
+    fm.shutdown()
+
+
 def test_shutdown_thread_pool():
     for k in range(5):
         fm = FileManager()
@@ -153,6 +399,17 @@ def test_shutdown_thread_pool():
 
 
 
+BENCHMARK_ROUNDS = 5
+
+
+def cold_cache(file_manager, file_path):
+    """Benchmark setup: start every round with an empty cache and idle prefetch workers."""
+    pending = file_manager._get_state(file_path)['prefetch_futures'].copy()
+    file_manager.clear_cache(file_path)  # return value must not leak into benchmark.pedantic
+    # Loads that were already running are not cancelled; let them finish outside the timing
+    concurrent.futures.wait(pending)
+
+
 def access_pattern(file_manager, file_path):
     """
     Defines a sequence of data access to be measured.
@@ -160,20 +417,20 @@ def access_pattern(file_manager, file_path):
     benefit of prefetching will appear on chunks 1 through 4.
     """
     for i in range(5):
-        # Consume the generator by converting to a list to ensure
-        # the data is fully processed.
-        _ = list(file_manager.get_signal_segment(file_path, i))
+        # Drain the generator without materializing a list, so each tile
+        # can be freed as soon as the next one is produced.
+        for _tile in file_manager.get_signal_segment(file_path, i):
+            pass
         # time.sleep(0.1)
 
 
 @pytest.mark.benchmark
-def test_with_prefetch_real_file(benchmark, mef3_file):
+def test_with_prefetch_real_file(benchmark, fm_with_prefetch, mef3_file):
     """Benchmark the access pattern WITH prefetching on a REAL file."""
     # this is much faster than no-prefetch for data with 256 channels. If this is much slower, the test is probably using a few channels.
-    fm = FileManager(n_prefetch=10, cache_capacity_multiplier=10, max_workers=12)  # Prefetching is enabled
-    fm.open_file(mef3_file)
-    fm.set_signal_segment_size(mef3_file, seconds=60)  # Use 1-second segments
-    n_ch = len(fm._files[mef3_file]['reader'].channels)
+    fm = fm_with_prefetch
+    n_prefetch, cache_capacity_multiplier, max_workers = FM_PREFETCH_CONFIG
+    n_ch = len(fm._get_state(mef3_file)['reader'].channels)
     record_benchmark_setup(
         benchmark,
         access="FileManager access_pattern WITH prefetch (in-process)",
@@ -181,21 +438,23 @@ def test_with_prefetch_real_file(benchmark, mef3_file):
         total_channels=n_ch,
         active_channels=n_ch,
         fs=256, precision=3, duration_s=5 * 60,  # matches the mef3_file fixture
-        num_chunks=5, segment_size_s=60, rounds="auto",
+        num_chunks=5, segment_size_s=FM_SEGMENT_SIZE_S, rounds=BENCHMARK_ROUNDS,
         server="FileManager (in-process, no gRPC)",
-        n_prefetch=10, cache_capacity_multiplier=10, prefetch_workers=12,
+        n_prefetch=n_prefetch, cache_capacity_multiplier=cache_capacity_multiplier,
+        prefetch_workers=max_workers,
+    )
+    benchmark.pedantic(
+        access_pattern, args=(fm, mef3_file),
+        setup=lambda: cold_cache(fm, mef3_file), iterations=1, rounds=BENCHMARK_ROUNDS,
     )
-    benchmark(access_pattern, fm, mef3_file)
-    fm.shutdown()
 
 
 @pytest.mark.benchmark
-def test_no_prefetch_real_file(benchmark, mef3_file):
+def test_no_prefetch_real_file(benchmark, fm_no_prefetch, mef3_file):
     """Benchmark the access pattern WITHOUT prefetching on a REAL file."""
-    fm = FileManager(n_prefetch=0, cache_capacity_multiplier=0)  # Prefetching is turned OFF
-    fm.open_file(mef3_file)
-    fm.set_signal_segment_size(mef3_file, seconds=60)  # Use 1-second segments
-    n_ch = len(fm._files[mef3_file]['reader'].channels)
+    fm = fm_no_prefetch
+    n_prefetch, cache_capacity_multiplier, max_workers = FM_NO_PREFETCH_CONFIG
+    n_ch = len(fm._get_state(mef3_file)['reader'].channels)
     record_benchmark_setup(
         benchmark,
         access="FileManager access_pattern WITHOUT prefetch (in-process)",
@@ -203,12 +462,15 @@ def test_no_prefetch_real_file(benchmark, mef3_file):
         total_channels=n_ch,
         active_channels=n_ch,
         fs=256, precision=3, duration_s=5 * 60,  # matches the mef3_file fixture
-        num_chunks=5, segment_size_s=60, rounds="auto",
+        num_chunks=5, segment_size_s=FM_SEGMENT_SIZE_S, rounds=BENCHMARK_ROUNDS,
         server="FileManager (in-process, no gRPC)",
-        n_prefetch=0, cache_capacity_multiplier=0, prefetch_workers=4,
+        n_prefetch=n_prefetch, cache_capacity_multiplier=cache_capacity_multiplier,
+        prefetch_workers=max_workers,
+    )
+    benchmark.pedantic(
+        access_pattern, args=(fm, mef3_file),
+        setup=lambda: cold_cache(fm, mef3_file), iterations=1, rounds=BENCHMARK_ROUNDS,
     )
-    benchmark(access_pattern, fm, mef3_file)
-    fm.shutdown()
 
 
 def test_integrity_multithreaded_read_real(mef3_file):
@@ -218,7 +480,7 @@ def test_integrity_multithreaded_read_real(mef3_file):
     fm.open_file(file_path)
     chunk_seconds = 60
     fm.set_signal_segment_size(file_path, chunk_seconds)
-    state = fm._files[file_path]
+    state = fm._get_state(file_path)
     num_chunks = len(state['chunks'])
 
     def read_all_chunks():
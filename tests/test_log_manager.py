@@ -0,0 +1,126 @@
+import logging
+import logging.handlers
+import multiprocessing
+import os
+import subprocess
+import sys
+
+import pytest
+
+from brainmaze_mef3_server.server import log_manager
+from brainmaze_mef3_server.server.log_manager import setup_logging, stop_logging
+
+
+@pytest.fixture(autouse=True)
+def isolated_logging():
+    """Run each test against a clean root logger and restore the session's logging afterwards.
+
+    The logging installed when ``mef3_server`` was imported is detached, not stopped, so its
+    listener keeps running untouched and takes over again once the test is done.
+    """
+    root_logger = logging.getLogger()
+    saved_handlers = root_logger.handlers[:]
+    saved_level = root_logger.level
+    saved_state = (log_manager._listener, log_manager._last_config)
+    for h in saved_handlers:
+        root_logger.removeHandler(h)
+    log_manager._listener, log_manager._last_config = None, None
+    try:
+        yield
+    finally:
+        stop_logging()
+        for h in root_logger.handlers[:]:
+            h.close()
+            root_logger.removeHandler(h)
+        for h in saved_handlers:
+            root_logger.addHandler(h)
+        root_logger.setLevel(saved_level)
+        log_manager._listener, log_manager._last_config = saved_state
+
+
+def test_setup_logging_uses_queue_listener(tmp_path):
+    log_file, listener = setup_logging(str(tmp_path), logging.INFO)
+    try:
+        root_handlers = logging.getLogger().handlers
+        queue_handlers = [h for h in root_handlers if isinstance(h, logging.handlers.QueueHandler)]
+        assert len(queue_handlers) == 1
+        assert not any(isinstance(h, logging.FileHandler) for h in root_handlers)
+
+        logging.getLogger("brainmaze_mef3_server.test").info("hello from queue")
+    finally:
+        # Stopping the listener drains the queue to the file handler
+        stop_logging()
+
+    with open(log_file) as f:
+        assert "hello from queue" in f.read()
+
+
+def test_cached_time_formatter_matches_default():
+    from brainmaze_mef3_server.server.log_manager import CachedTimeFormatter
+
+    fmt = '%(asctime)s %(message)s'
+    cached = CachedTimeFormatter(fmt)
+    reference = logging.Formatter(fmt)
+    for created in (1_700_000_000.125, 1_700_000_000.987, 1_700_000_001.5):
+        record = logging.makeLogRecord({'msg': 'x', 'created': created, 'msecs': (created % 1) * 1000})
+        assert cached.format(record) == reference.format(record)
+
+
+def test_setup_logging_is_idempotent(tmp_path):
+    log_file, listener = setup_logging(str(tmp_path), logging.INFO)
+    try:
+        file_handler = next(h for h in listener.handlers if isinstance(h, logging.FileHandler))
+
+        # Same directory: handlers and log file are reused, only the level changes
+        log_file2, listener2 = setup_logging(str(tmp_path), logging.DEBUG)
+        assert (log_file2, listener2) == (log_file, listener)
+        assert logging.getLogger().level == logging.DEBUG
+        assert sum(isinstance(h, logging.handlers.QueueHandler) for h in logging.getLogger().handlers) == 1
+
+        # New directory: previous file handler is closed
+        setup_logging(str(tmp_path / "other"), logging.INFO)
+        assert file_handler.stream is None
+    finally:
+        stop_logging()
+
+
+def test_stop_logging_detaches_queue_handler(tmp_path):
+    setup_logging(str(tmp_path), logging.INFO)
+    stop_logging()
+    root_handlers = logging.getLogger().handlers
+    assert not any(isinstance(h, logging.handlers.QueueHandler) for h in root_handlers)
+    # Calling it again is a no-op
+    stop_logging()
+
+
+def _log_in_child(message):
+    logging.getLogger("brainmaze_mef3_server.test").info(message)
+    # multiprocessing children skip atexit; flush the way the server's SIGTERM handler does
+    stop_logging()
+
+
+@pytest.mark.skipif(not hasattr(os, 'fork'), reason="requires fork")
+def test_forked_child_logs_reach_file(tmp_path):
+    log_file, _ = setup_logging(str(tmp_path), logging.INFO)
+    proc = multiprocessing.get_context('fork').Process(target=_log_in_child, args=("hello from child",))
+    proc.start()
+    proc.join(timeout=10)
+    assert proc.exitcode == 0
+    stop_logging()
+
+    with open(log_file) as f:
+        assert "hello from child" in f.read()
+
+
+def test_queued_records_are_written_on_normal_exit(tmp_path):
+    script = (
+        "import logging\n"
+        "from brainmaze_mef3_server.server.log_manager import setup_logging\n"
+        f"setup_logging({str(tmp_path)!r}, logging.INFO)\n"
+        "for i in range(5000):\n"
+        "    logging.getLogger('exit_test').info(f'record {i}')\n"
+    )
+    subprocess.run([sys.executable, "-c", script], check=True, timeout=60, capture_output=True)
+
+    log_file, = tmp_path.glob("server_*.log")
+    assert "record 4999" in log_file.read_text()